@@ -0,0 +1,54 @@
+# Memory benchmark: bytes per Employee before and after __slots__ + lazy email.
+#
+# "Before" is the old layout - a per-instance __dict__ holding first, last, pay and an
+# email string built in __init__.  "After" is each of the slotted Employee classes in
+# this folder.  tracemalloc counts every allocation made while creating N employees
+# (the object, its __dict__ if any, and the email string), divided by N.
+
+import tracemalloc
+
+import inheritance
+import oop
+import propertydecorators
+import specialmethods
+
+N = 100_000
+
+
+class DictEmployee: # the old version, for comparison
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.email = first + '.' + last + '@company.com'
+        self.pay = pay
+
+
+def bytes_per_employee(make):
+    """Average bytes allocated per employee when creating N of them with make(i)."""
+    # Build the names first, so only the employees themselves are measured
+    firsts = [f'First{i}' for i in range(N)]
+    lasts = [f'Last{i}' for i in range(N)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    employees = [make(firsts[i], lasts[i], 50000 + i) for i in range(N)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding them is 8 bytes per employee; don't count it
+    return (after - before) / N - 8
+
+
+cases = [
+    ('dict + eager email (before)', DictEmployee),
+    ('oop.Employee', oop.Employee),
+    ('specialmethods.Employee', specialmethods.Employee),
+    ('inheritance.Employee', inheritance.Employee),
+    ('inheritance.Developer', lambda first, last, pay: inheritance.Developer(first, last, pay, 'python')),
+    ('propertydecorators.Employee', lambda first, last, pay: propertydecorators.Employee(first, last)),
+]
+
+if __name__ == "__main__":
+    baseline = None
+    for name, make in cases:
+        size = bytes_per_employee(make)
+        baseline = baseline or size
+        print(f'{name:30s} {size:7.1f} bytes/employee  ({size / baseline:.0%} of before)')
@@ -1,12 +1,63 @@
-class Employee:
+from array import array
+from itertools import repeat
+from operator import mul
 
-    raise_amt = 1.04 # Class variable
+from overridable import Overridable, OverridableMeta
+
+
+class RaiseRate(Overridable):
+    # raise_amt, which also tells the employee's Payroll when one employee gets their own
+    def __set__(self, obj, value):
+        super().__set__(obj, value)
+        if obj._payroll is not None:
+            obj._payroll.overrides[id(obj)] = obj
+
+    def __delete__(self, obj):
+        super().__delete__(obj)
+        if obj._payroll is not None:
+            obj._payroll.overrides.pop(id(obj), None)
+
+
+class Employee(metaclass=OverridableMeta):
+    # __slots__ gives each instance fixed storage for just these attributes instead of a
+    # per-instance __dict__, which matters when there are millions of employees.
+    __slots__ = ('first', 'last', '_pay', '_payroll', '_slot', '_managers', '_raise_amt')
+
+    raise_amt = RaiseRate(1.04) # Class variable - emp.raise_amt = 1.05 still works for one employee, see overridable.py
+    pay_epoch = 0 # bumped by Payroll.apply_raises, so Managers know their pay totals are stale
 
     def __init__(self, first, last, pay):
         self.first = first
         self.last = last
-        self.email = first + '.'+ last + '@company.com' #this is an alternative way to do the same thing as above.
+        self._payroll = None # set by Payroll.add - then pay lives in the payroll's array instead
+        self._slot = None
+        self._managers = None # dict of the Managers this employee reports to, made on first add_emp
         self.pay = pay
+
+    # pay is a property so that an Employee on a Payroll reads and writes its entry in the
+    # payroll's array - the object stays a valid "view" even after a bulk raise.
+    @property
+    def pay(self):
+        if self._payroll is None:
+            return self._pay
+        return self._payroll.pay[type(self)][self._slot]
+
+    @pay.setter
+    def pay(self, value):
+        if self._managers:
+            change = value - self.pay
+        if self._payroll is None:
+            self._pay = value
+        else:
+            self._payroll.pay[type(self)][self._slot] = Payroll.whole(self, value)
+        if self._managers:
+            # Keep the report_pay total of every manager above us up to date, once each
+            for mgr in Manager._above(self):
+                mgr._report_pay += change
+
+    @property
+    def email(self): # built when asked for instead of stored on every instance
+        return self.first + '.' + self.last + '@company.com'
         
     def fullname(self):
         return '{} {}'.format(self.first, self.last)
@@ -15,43 +66,212 @@ class Employee:
         self.pay = int(self.pay * self.raise_amt)
 
 class Developer(Employee):
-    raise_amt = 1.10 # Class variable
+    __slots__ = ('prog_lang',) # only the new attribute - the rest come from Employee
+    raise_amt = RaiseRate(1.10) # Class variable
 
     def __init__(self, first, last, pay, prog_lang):
         super().__init__(first, last, pay) # This passes the first, last, and pay to the Employee class - the super class of Developer 
         self.prog_lang = prog_lang
 
 class Manager(Employee):
+    # Reports are the keys of a dict: insertion ordered like a list, but "in", add and
+    # remove are O(1) instead of O(n).  Every manager also keeps everyone below it (direct
+    # and indirect reports) in a dict from person to the number of reporting paths that
+    # lead to them, plus the total pay of those people, updated on each change - so
+    # headcount(), report_pay() and all_reports() don't have to walk the org chart.
+    # Someone reporting to two managers under the same boss has two paths to the boss,
+    # but is one person: they're counted once.
+    __slots__ = ('_reports', '_below', '_report_pay', '_epoch')
 
     def __init__(self, first, last, pay, employees = None):
         super().__init__(first, last, pay)
-        if employees is None:
-            self.employees = []
-        else:
-            self.employees = employees
+        self._reports = {}
+        self._below = {}
+        self._report_pay = 0
+        self._epoch = Employee.pay_epoch
+        if employees is not None:
+            for emp in employees:
+                self.add_emp(emp)
+
+    @property
+    def employees(self):
+        return tuple(self._reports) # read only - use add_emp and remove_emp to change it
+
+    @staticmethod
+    def _above(emp):
+        """Every manager above emp, directly or indirectly, each once."""
+        found = {}
+        stack = list(emp._managers or ())
+        while stack:
+            mgr = stack.pop()
+            if mgr not in found:
+                found[mgr] = None
+                if mgr._managers:
+                    stack.extend(mgr._managers)
+        return found
 
     def add_emp(self, emp):
-        if emp not in self.employees:
-              self.employees.append(emp)
+        if emp in self._reports:
+            return
+        if emp is self or (isinstance(emp, Manager) and self in emp._below):
+            raise ValueError(f"{emp.fullname()} can't report to {self.fullname()}: that would make a reporting cycle")
+        self._reports[emp] = None
+        if emp._managers is None:
+            emp._managers = {}
+        emp._managers[self] = None
+        self._add_paths(emp, 1)
 
     def remove_emp(self, emp):
-        if emp in self.employees:
-              self.employees.remove(emp)
-            
+        if emp in self._reports:
+            del self._reports[emp]
+            del emp._managers[self]
+            self._add_paths(emp, -1)
+
+    def _add_paths(self, emp, sign):
+        """Add (sign 1) or take away (sign -1) the paths through the link from self to emp.
+
+        Each manager at or above self gains or loses paths(manager -> self) * paths(emp -> x)
+        paths to emp and to each person x below emp.  People whose count drops to 0 no
+        longer report to that manager; their pay leaves its total.
+        """
+        people = {emp: 1}
+        if isinstance(emp, Manager):
+            people.update(emp._below)
+        for mgr in [self, *Manager._above(self)]:
+            mgr.report_pay() # bring its total up to date first if a Payroll raise made it stale
+            paths = 1 if mgr is self else mgr._below[self]
+            below = mgr._below
+            for person, count in people.items():
+                now = below.get(person, 0) + sign * paths * count
+                if now:
+                    if person not in below:
+                        mgr._report_pay += person.pay
+                    below[person] = now
+                else:
+                    del below[person]
+                    mgr._report_pay -= person.pay
+
     def print_emps(self):
-        for emp in self.employees:
+        for emp in self._reports:
             print('-->', emp.fullname())
 
-dev_1 = Developer('Hunter', 'Schafer', 50000, 'python')
-dev_2 = Developer('Jacob', 'Elordi', 60000, 'java')
+    def headcount(self):
+        """Number of people under this manager, directly or indirectly."""
+        return len(self._below)
+
+    def report_pay(self):
+        """Total pay of everyone under this manager, directly or indirectly.
+
+        A Payroll bulk raise changes pay without going through the pay property, so
+        after one the total is recomputed once, then kept up to date again.
+        """
+        if self._epoch != Employee.pay_epoch:
+            self._report_pay = sum(person.pay for person in self._below)
+            self._epoch = Employee.pay_epoch
+        return self._report_pay
+
+    def all_reports(self):
+        """Everyone under this manager, each once (a read-only view, kept up to date)."""
+        return self._below.keys()
+
+class Payroll:
+    """Pay for a lot of employees, kept in one contiguous array per class.
+
+    Employees of the same class (Employee, Developer, Manager, ...) share a raise_amt,
+    so apply_raises can give every member of a class its raise in one pass over that
+    class's array instead of calling apply_raise on each object.  Employees added to a
+    payroll keep working as before: their pay property reads and writes their slot.
+    The arrays hold whole numbers only, so pay on a payroll has to be an int.
+    """
+
+    def __init__(self, employees=()):
+        self.pay = {}       # class -> array of pay, one slot per employee
+        self.members = {}   # class -> list of employees, in the same order as the array
+        self.overrides = {} # id(emp) -> emp for the members with a raise_amt of their own
+        for emp in employees:
+            self.add(emp)
+
+    @staticmethod
+    def whole(emp, pay):
+        """pay, if it fits in a payroll's array; TypeError otherwise, rather than rounding it."""
+        if not isinstance(pay, int):
+            raise TypeError(f"{emp.fullname()}'s pay {pay!r} is not a whole number; "
+                            f"pay on a Payroll has to be an int")
+        return pay
+
+    def add(self, emp):
+        if emp._payroll is self:
+            return
+        if emp._payroll is not None:
+            emp._payroll.remove(emp)
+        cls = type(emp)
+        pay = self.whole(emp, emp.pay)
+        block = self.pay.setdefault(cls, array('q'))
+        emp._payroll, emp._slot = self, len(block)
+        block.append(pay)
+        self.members.setdefault(cls, []).append(emp)
+        if hasattr(emp, '_raise_amt'): # has its own raise_amt
+            self.overrides[id(emp)] = emp
+
+    def remove(self, emp):
+        """Take emp off the payroll; its pay goes back to being a plain attribute."""
+        if emp._payroll is not self:
+            return
+        cls, slot = type(emp), emp._slot
+        block, members = self.pay[cls], self.members[cls]
+        pay = block[slot]
+        # Move the last employee of the class into the hole so the array stays contiguous
+        last = members.pop()
+        last_pay = block.pop()
+        if last is not emp:
+            members[slot] = last
+            block[slot] = last_pay
+            last._slot = slot
+        emp._payroll, emp._slot = None, None
+        emp._pay = pay
+        self.overrides.pop(id(emp), None)
+
+    def apply_raises(self):
+        """apply_raise for everyone, one pass per class using that class's raise_amt.
+
+        Same result as int(pay * raise_amt) for each employee.  The few employees
+        with a raise_amt of their own get theirs in a second pass over just them.
+        """
+        own = [(emp, int(emp.pay * emp.raise_amt)) for emp in self.overrides.values()]
+        for cls, block in self.pay.items():
+            block[:] = array('q', map(int, map(mul, block, repeat(cls.raise_amt))))
+        for emp, pay in own:
+            self.pay[type(emp)][emp._slot] = pay
+        # Manager.report_pay totals didn't see these changes
+        Employee.pay_epoch += 1
+
+    def total(self):
+        return sum(sum(block) for block in self.pay.values())
+
+    def __len__(self):
+        return sum(len(block) for block in self.pay.values())
+
+
+if __name__ == "__main__":
+    dev_1 = Developer('Hunter', 'Schafer', 50000, 'python')
+    dev_2 = Developer('Jacob', 'Elordi', 60000, 'java')
+
+    mgr_1 = Manager('Becky', 'Moore', 100000, [dev_1, dev_2])
+    mgr_2 = Manager('kevin', 'Moore', 100000, [dev_2])
+
+    print(isinstance(mgr_1, Employee)) # True
 
-mgr_1 = Manager('Becky', 'Moore', 100000, [dev_1, dev_2])
-mgr_2 = Manager('kevin', 'Moore', 100000, [dev_2])
+    #However, this wouldn't be true if we did the following:
+    print(isinstance(mgr_1, Developer)) # False
 
-print(isinstance(mgr_1, Employee)) # True
+    # This is because mgr_1 is an instance of the Manager class, which is a subclass of the Employee class. 
+    # Developer is also a subclass of the Employee class, but it is not a subclass of the Manager class.
 
-#However, this wouldn't be true if we did the following:
-print(isinstance(mgr_1, Developer)) # False
+    # Bulk raises: one pass per class over contiguous pay, and the objects still see their pay
+    payroll = Payroll([dev_1, dev_2, mgr_1, mgr_2])
+    payroll.apply_raises()
+    print(dev_1.pay, mgr_1.pay) # 55000 104000
 
-# This is because mgr_1 is an instance of the Manager class, which is a subclass of the Employee class. 
-# Developer is also a subclass of the Employee class, but it is not a subclass of the Manager class.
+    # Org chart totals are kept up to date as people are added and paid
+    ceo = Manager('Ada', 'Lovelace', 200000, [mgr_1, mgr_2])
+    print(ceo.headcount(), ceo.report_pay()) # 4 329000 - dev_2 reports to both managers, but is one person
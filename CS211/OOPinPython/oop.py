@@ -1,20 +1,101 @@
 # The basics of creating and Instantiating simple classes in python
 
-class Employee:
+from array import array
+from collections import deque
+from datetime import date
+from itertools import islice, repeat
+
+from overridable import Overridable, OverridableMeta
+
+class WorkdayCalendar: # Answers workday questions from tables built once per year, instead of date by date.
+    # For each year it keeps:
+    #   workday - a bitmap with one byte per day of the year, 1 for a workday
+    #   before  - before[i] is how many workdays come before day i of the year (prefix sums)
+    #   after   - after[i] is the day of the year of the first workday after day i, or len(year) if none
+    # so is_workday, count_between and next_workday are table lookups.  Days are given as datetime.date.
+
+    def __init__(self, holidays=(), weekend=(5, 6)): # 5 is saturday, 6 is sunday
+        self.holidays = set(holidays)
+        self.weekend = set(weekend)
+        self._years = {} # year -> (first day's ordinal, workday, before, after)
+
+    def add_holiday(self, day):
+        self.holidays.add(day)
+        self._years.pop(day.year, None) # that year's tables are rebuilt on next use
+
+    def remove_holiday(self, day):
+        self.holidays.discard(day)
+        self._years.pop(day.year, None)
+
+    def _year(self, year):
+        tables = self._years.get(year)
+        if tables is None:
+            start = date(year, 1, 1).toordinal()
+            days = date(year + 1, 1, 1).toordinal() - start
+            workday = bytearray(days)
+            first_weekday = date(year, 1, 1).weekday()
+            for i in range(days):
+                workday[i] = (first_weekday + i) % 7 not in self.weekend
+            for day in self.holidays:
+                if day.year == year:
+                    workday[day.toordinal() - start] = 0
+            before = array('I', [0]) * (days + 1)
+            for i in range(days):
+                before[i + 1] = before[i] + workday[i]
+            after = array('H', [days]) * days
+            for i in range(days - 2, -1, -1):
+                after[i] = i + 1 if workday[i + 1] else after[i + 1]
+            tables = self._years[year] = (start, workday, before, after)
+        return tables
+
+    def is_workday(self, day):
+        start, workday, _, _ = self._years.get(day.year) or self._year(day.year)
+        return workday[day.toordinal() - start] == 1
+
+    def count_between(self, first, last): # workdays from first up to but not including last, like range()
+        if last <= first:
+            return 0
+        start, _, before, _ = self._year(first.year)
+        count = -before[first.toordinal() - start]
+        for year in range(first.year, last.year): # whole years in between, from their tables
+            count += self._year(year)[2][-1]
+        start, _, before, _ = self._year(last.year)
+        return count + before[last.toordinal() - start]
+
+    def next_workday(self, day): # first workday after day
+        year = day.year
+        start, _, _, after = self._year(year)
+        i = after[day.toordinal() - start]
+        while i == len(after): # none left this year, so look from the start of the next
+            year += 1
+            start, workday, _, after = self._year(year)
+            if workday[0]:
+                return date(year, 1, 1)
+            i = after[0]
+            if i == len(after): # a whole year without one - with these weekend days and holidays there may be none ever
+                raise ValueError(f'no workdays in {year}; check the calendar\'s weekend and holidays')
+        return date.fromordinal(start + i)
+
+
+class Employee(metaclass=OverridableMeta):
+    __slots__ = ('first', 'last', 'pay', '_raise_amount') # the only attributes an instance can have - no __dict__ per object
 
     num_of_emps = 0 # Class variable
-    raise_amount = 1.06 # Class variable
+    raise_amount = Overridable(1.06) # Class variable - one employee can still get their own, see overridable.py
 
     def __init__(self, first, last, pay):
         self.first = first
         self.last = last
         self.pay = pay
-        self.email = f'{first}.{last}@company.com'
 
         Employee.num_of_emps += 1 
         #this will add 1 to the num_of_emps class variable every time a new instance of the class is created, 
         #not just when the __init__ method is called.
 
+    @property
+    def email(self): # computed from first and last on each access, like in propertydecorators.py
+        return f'{self.first}.{self.last}@company.com'
+
     def fullname(self):
         return '{} {}'.format(self.first, self.last)
     
@@ -30,16 +111,63 @@ class Employee:
         first, last, pay = emp_str.split('-')
         return cls(first, last, pay) #this will create a new instance of the class using the string above.
 
+    @classmethod
+    def from_strings(cls, emp_strs, chunk_size=4096): #bulk version of from_string, for big HR exports.
+        # emp_strs can be any iterable of 'first-last-pay' strings, including an open file (one per line).
+        # Each chunk is joined and split once instead of per line, the objects are made without running
+        # __init__, each attribute is filled in with one map() over the whole chunk, and num_of_emps goes
+        # up once per chunk.  Unlike from_string, pay is converted to an int.  Chunks are kept small so
+        # their temporary lists are gone before the garbage collector has to scan them.  The collector
+        # still scans the new Employees a few times; a script that owns its process can turn it off
+        # around the call (gc.disable() ... gc.enable()) for about twice the speed again.
+        if cls.__init__ is not Employee.__init__:
+            # Skipping __init__ is only safe when it is ours - a subclass's may do more, so it gets run
+            employees = []
+            for emp_str in emp_strs:
+                first, last, pay = emp_str.split('-')
+                employees.append(cls(first, last, int(pay)))
+            return employees
+        set_first, set_last, set_pay = cls.first.__set__, cls.last.__set__, cls.pay.__set__
+        employees = []
+        lines = iter(emp_strs)
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                break
+            # Every line needs exactly 2 dashes - checking the total isn't enough, since a line
+            # with too many and one with too few can add up right.  map runs the counts in C.
+            if any(map((2).__ne__, map(str.count, chunk, repeat('-')))):
+                for emp_str in chunk: # find the bad line and fail the same way from_string would
+                    first, last, pay = emp_str.split('-')
+            fields = '-'.join(chunk).split('-')
+            pays = list(map(int, fields[2::3])) # int() ignores the trailing newline
+            batch = list(map(object.__new__, repeat(cls, len(chunk))))
+            deque(map(set_first, batch, fields[0::3]), maxlen=0) # maxlen=0 just runs the map
+            deque(map(set_last, batch, fields[1::3]), maxlen=0)
+            deque(map(set_pay, batch, pays), maxlen=0)
+            employees += batch
+            Employee.num_of_emps += len(batch)
+        return employees
+
+    calendar = WorkdayCalendar() # Class variable - add holidays here and is_workday will skip them
+
     @staticmethod #this is a decorator, which alternates the functionality of the method below.
     def is_workday(day):
-        if day.weekday() == 5 or day.weekday() == 6: #this will check if the day is a weekend - 5 is saturday, 6 is sunday.
-            return False
-        return True
+        return Employee.calendar.is_workday(day) #saturdays and sundays (and any holidays) are not workdays.
+
+if __name__ == "__main__":
+    emp_1 = Employee('Hunter', 'Schafer', 50000)
+    emp_2 = Employee('Jacob', 'Elordi', 60000)
+
+    import datetime
+    my_date = datetime.date(2020, 7, 10)
 
-emp_1 = Employee('Hunter', 'Schafer', 50000)
-emp_2 = Employee('Jacob', 'Elordi', 60000)
+    print(Employee.is_workday(my_date)) #this will print True because it is a weekday.
 
-import datetime
-my_date = datetime.date(2020, 7, 10)
+    # Payroll periods: count workdays in a range, and find the next one
+    Employee.calendar.add_holiday(datetime.date(2020, 7, 3))
+    print(Employee.calendar.count_between(datetime.date(2020, 7, 1), datetime.date(2020, 8, 1))) # 22
+    print(Employee.calendar.next_workday(datetime.date(2020, 7, 2))) # 2020-07-06
 
-print(Employee.is_workday(my_date)) #this will print True because it is a weekday.
\ No newline at end of file
+    emps = Employee.from_strings(['John-Doe-70000', 'Steve-Smith-30000\n', 'Jane-Doe-90000\n'])
+    print(emps[1].fullname(), emps[1].pay, Employee.num_of_emps) # Steve Smith 30000 5
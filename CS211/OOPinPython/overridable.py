@@ -0,0 +1,69 @@
+# A class variable that single instances can still override, for classes with __slots__.
+#
+# Normally emp.raise_amt = 1.05 stores 1.05 in that one employee's __dict__, hiding the
+# class variable for just that employee.  With __slots__ there's no __dict__, so the same
+# assignment fails with AttributeError: ... is read-only.  Declaring the class variable as
+#
+#     raise_amt = Overridable(1.04)
+#
+# and adding a slot named '_raise_amt' brings that back: the instance's own value is kept
+# in the slot, and reading it gives that value if one was set, otherwise the class's.
+#
+# A class using it should also have metaclass=OverridableMeta, so the class variable can
+# still be changed the usual way - Employee.raise_amt = 1.05, or raise_amt = 1.5 in a
+# subclass - without replacing the descriptor with a plain number.
+
+from inspect import getattr_static
+
+
+class Overridable:
+    def __init__(self, default):
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.slot = '_' + name
+
+    def __get__(self, obj, cls=None):
+        if obj is not None:
+            try:
+                return getattr(obj, self.slot)
+            except AttributeError: # never set on this instance - use the class's value
+                pass
+        return self.default
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+    def __delete__(self, obj):
+        delattr(obj, self.slot)
+
+
+class OverridableMeta(type):
+    def __new__(mcls, name, bases, namespace, **kwargs):
+        # raise_amt = 1.5 in a subclass body: make it the subclass's own Overridable
+        # (of the same kind as the inherited one)
+        for attr, value in list(namespace.items()):
+            if not isinstance(value, Overridable):
+                inherited = [getattr_static(base, attr, None) for base in bases]
+                for descriptor in inherited:
+                    if isinstance(descriptor, Overridable):
+                        namespace[attr] = type(descriptor)(value)
+                        break
+        return super().__new__(mcls, name, bases, namespace, **kwargs)
+
+    def __setattr__(cls, name, value):
+        # Employee.raise_amt = 1.05: change the class's value, keep the descriptor
+        # This runs on every class attribute write (Employee.num_of_emps += 1 too), so
+        # it only looks the name up in the class dicts - no getattr_static.
+        if not isinstance(value, Overridable):
+            for klass in cls.__mro__:
+                if name in klass.__dict__:
+                    current = klass.__dict__[name]
+                    if isinstance(current, Overridable):
+                        if klass is cls:
+                            current.default = value
+                            return
+                        value = type(current)(value) # inherited - give cls its own
+                        value.__set_name__(cls, name)
+                    break
+        super().__setattr__(name, value)
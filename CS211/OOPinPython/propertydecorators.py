@@ -1,23 +1,101 @@
+from functools import wraps
+
+
+class cached_slot_property(property):
+    # A property whose getter runs once: the value is kept in the slot named '_' + the property's
+    # name, and later reads return it without running the getter again.  It's functools.cached_property
+    # for classes with __slots__ (which has no __dict__ to cache in).  Being a property, it still takes
+    # .setter and .deleter.  clear(obj) empties the slot, so the next read runs the getter again.
+    #
+    # The caching is done by wrapping the getter, rather than in a Python __get__, so reads still go
+    # through property's own C __get__: a cached read costs one small function call.
+
+    def __init__(self, fget=None, fset=None, fdel=None, doc=None):
+        if fget is not None and not hasattr(fget, 'compute'): # .setter/.deleter pass the wrapped one back in
+            fget = self._caching(fget)
+        super().__init__(fget, fset, fdel, doc)
+
+    @staticmethod
+    def _caching(compute):
+        @wraps(compute)
+        def getter(obj):
+            try:
+                return getter.read(obj)
+            except AttributeError: # slot empty - not computed yet, or cleared
+                value = compute(obj)
+                getter.write(obj, value)
+                return value
+        getter.compute = compute
+        return getter
+
+    def __set_name__(self, owner, name):
+        slot = owner.__dict__['_' + name] # the slot's own descriptor
+        self.fget.read, self.fget.write = slot.__get__, slot.__set__
+        self.slot = slot
+
+    def clear(self, obj):
+        try:
+            self.slot.__delete__(obj)
+        except AttributeError: # not computed yet - nothing to clear
+            pass
+
+
 class Employee:
+    # No per-instance __dict__.  first and last are stored in _first and _last; _email and
+    # _fullname hold the cached email and fullname, filled in the first time they're read.
+    __slots__ = ('_first', '_last', '_email', '_fullname')
 
     def __init__(self, first, last):
         self.first = first
         self.last = last
 
+    # first and last are properties so that changing them clears the cached values built from them
+    @property
+    def first(self):
+        return self._first
+
+    @first.setter
+    def first(self, value):
+        self._first = value
+        self._clear_cache()
+
+    @first.deleter
+    def first(self):
+        del self._first
+        self._clear_cache()
+
     @property
+    def last(self):
+        return self._last
+
+    @last.setter
+    def last(self, value):
+        self._last = value
+        self._clear_cache()
+
+    @last.deleter
+    def last(self):
+        del self._last
+        self._clear_cache()
+
+    def _clear_cache(self):
+        Employee.email.clear(self)
+        Employee.fullname.clear(self)
+
+    @cached_slot_property
     def email(self):
         return '{}.{}@email.com'.format(self.first, self.last)
-    
-    @property
+
+    @cached_slot_property
     def fullname(self):
         return '{} {}'.format(self.first, self.last)
-    
+
     @fullname.setter
     def fullname(self, name):
         first, last = name.split(' ')
         self.first = first
         self.last = last
-    
+
     @fullname.deleter
     def fullname(self):
         print('Delete Name!')
@@ -25,14 +103,15 @@ class Employee:
         self.last = None
 
 
-emp_1 = Employee('John', 'Schafer')
+if __name__ == "__main__":
+    emp_1 = Employee('John', 'Schafer')
 
-emp_1.fullname = 'Hunter Schafer'
+    emp_1.fullname = 'Hunter Schafer'
 
-print(emp_1.first)
-print(emp_1.email)
-print(emp_1.fullname)
+    print(emp_1.first)
+    print(emp_1.email)
+    print(emp_1.fullname)
 
-del emp_1.fullname
+    del emp_1.fullname
 
-#this is a nice feature - we can access attributes without having getters and setters everywhere, but we can still use getters and setters if we want or need to.
\ No newline at end of file
+    #this is a nice feature - we can access attributes without having getters and setters everywhere, but we can still use getters and setters if we want or need to.
@@ -1,12 +1,37 @@
-class Employee:
+from bisect import bisect_left, insort
 
-    raise_amt = 1.04 # Class variable
+from overridable import Overridable, OverridableMeta
+
+
+class Employee(metaclass=OverridableMeta):
+    __slots__ = ('first', 'last', '_pay', '_collections', '_raise_amt') # fixed attribute storage, smaller than a __dict__
+
+    raise_amt = Overridable(1.04) # Class variable that one employee can override, see overridable.py
 
     def __init__(self, first, last, pay):
         self.first = first
         self.last = last
-        self.email = first + '.'+ last + '@company.com' #this is an alternative way to do the same thing as above.
+        self._collections = None # EmployeeCollections this employee is in, made on first add
         self.pay = pay
+
+    @property
+    def pay(self):
+        return self._pay
+
+    @pay.setter
+    def pay(self, value):
+        if self._collections:
+            old = self._pay
+            self._pay = value
+            # Let every collection we're in update its totals and ranking
+            for collection in self._collections:
+                collection._repay(self, old, value)
+        else:
+            self._pay = value
+
+    @property
+    def email(self): # not stored - one less string per employee
+        return self.first + '.' + self.last + '@company.com'
         
     def fullname(self):
         return '{} {}'.format(self.first, self.last)
@@ -30,24 +55,185 @@ class Employee:
     
     def __add__(self, other):
         return self.pay + other.pay
+
+    # sum() starts from 0, so 0 + emp ends up here; this lets sum(employees) and emp_1 + emp_2 + emp_3 work
+    def __radd__(self, other):
+        return other + self.pay
     
     def __len__(self):
         return len(self.fullname())
 
-emp_1 = Employee('Hunter', 'Schafer', 50000)
-emp_2 = Employee('Jacob', 'Elordi', 60000)
 
-# print(repr(emp_1))
-# print(str(emp_1))
+class SortedBlocks:
+    """A sorted list kept as a list of short sorted blocks.
+
+    Adding or removing an item bisects to its block and only shifts items
+    within that block, instead of shifting the whole list as insort and
+    del do on one long list.
+    """
+
+    BLOCK = 512 # blocks are split when they grow past twice this
+
+    def __init__(self, items=()):
+        items = sorted(items) # one sort for a bulk load
+        self.blocks = [items[i:i + self.BLOCK] for i in range(0, len(items), self.BLOCK)]
+        self.maxes = [block[-1] for block in self.blocks] # last item of each block, to bisect on
+
+    def add(self, item):
+        if not self.blocks:
+            self.blocks.append([item])
+            self.maxes.append(item)
+            return
+        i = min(bisect_left(self.maxes, item), len(self.blocks) - 1)
+        block = self.blocks[i]
+        insort(block, item)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * self.BLOCK:
+            self.blocks[i:i + 1] = [block[:self.BLOCK], block[self.BLOCK:]]
+            self.maxes[i:i + 1] = [block[self.BLOCK - 1], block[-1]]
+
+    def remove(self, item):
+        i = bisect_left(self.maxes, item)
+        block = self.blocks[i]
+        del block[bisect_left(block, item)]
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+
+    def largest(self, k):
+        """The k largest items, largest first."""
+        found = []
+        for block in reversed(self.blocks):
+            if len(found) >= k:
+                break
+            found.extend(reversed(block[-(k - len(found)):]))
+        return found
+
+
+class EmployeeCollection:
+    """A set of employees that keeps its pay statistics up to date as it changes.
+
+    Adding, removing or changing the pay of a member (apply_raise, or
+    assigning pay) updates the running total, the per-class totals and the
+    members sorted by pay, so sum() and mean() are O(1), by_class() is
+    O(number of classes) and top(k) is O(k) - no pass over every member.
+    Building a collection, and apply_raises, sort once instead.
+    """
+
+    def __init__(self, employees=()):
+        self._members = {} # id(emp) -> emp, insertion ordered; the ids are what _by_pay sorts on
+        self._total = 0
+        self._groups = {} # class -> [count, total pay]
+        self._bulk = False # True while apply_raises is changing every member's pay
+        for emp in employees:
+            if id(emp) not in self._members:
+                self._join(emp)
+                self._total += emp.pay
+                self._groups[type(emp)][1] += emp.pay
+        self._by_pay = SortedBlocks((emp.pay, emp_id) for emp_id, emp in self._members.items())
+
+    def _join(self, emp):
+        self._members[id(emp)] = emp
+        if emp._collections is None:
+            emp._collections = {}
+        emp._collections[self] = None
+        self._groups.setdefault(type(emp), [0, 0])[0] += 1
+
+    def add(self, emp):
+        if id(emp) in self._members:
+            return
+        self._join(emp)
+        self._include(emp, emp.pay)
+
+    def remove(self, emp):
+        if self._members.get(id(emp)) is not emp:
+            raise KeyError(emp) # like set.remove
+        del self._members[id(emp)]
+        del emp._collections[self]
+        group = self._groups[type(emp)]
+        group[0] -= 1
+        self._exclude(emp, emp.pay)
+        if not group[0]:
+            del self._groups[type(emp)]
+
+    def _include(self, emp, pay):
+        self._total += pay
+        self._groups[type(emp)][1] += pay
+        self._by_pay.add((pay, id(emp)))
+
+    def _exclude(self, emp, pay):
+        self._total -= pay
+        self._groups[type(emp)][1] -= pay
+        self._by_pay.remove((pay, id(emp)))
+
+    def _repay(self, emp, old, new): # called by Employee.pay when a member's pay changes
+        if not self._bulk: # apply_raises recomputes everything when it's done
+            self._exclude(emp, old)
+            self._include(emp, new)
+
+    def apply_raises(self):
+        """Raise every member, then recompute the totals and re-sort once."""
+        self._bulk = True
+        try:
+            for emp in list(self._members.values()):
+                emp.apply_raise()
+        finally:
+            self._bulk = False
+            self._total = 0
+            for group in self._groups.values():
+                group[1] = 0
+            for emp in self._members.values():
+                self._total += emp.pay
+                self._groups[type(emp)][1] += emp.pay
+            self._by_pay = SortedBlocks((emp.pay, emp_id) for emp_id, emp in self._members.items())
+
+    def sum(self):
+        return self._total
+
+    def mean(self):
+        return self._total / len(self._members) if self._members else 0
+
+    def by_class(self):
+        """{class: (count, total pay)} for each class of employee in the collection."""
+        return {cls: (count, total) for cls, (count, total) in self._groups.items()}
+
+    def top(self, k):
+        """The k best paid members, highest pay first."""
+        if k <= 0:
+            return []
+        return [self._members[emp_id] for _, emp_id in self._by_pay.largest(k)]
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, emp):
+        return self._members.get(id(emp)) is emp
 
-# These two lines of code do the same thing as the two lines above.
-print(emp_1.__repr__())
-print(emp_1.__str__())
+    def __iter__(self):
+        return iter(self._members.values())
 
-print(len(emp_1))
 
+if __name__ == "__main__":
+    emp_1 = Employee('Hunter', 'Schafer', 50000)
+    emp_2 = Employee('Jacob', 'Elordi', 60000)
 
+    # print(repr(emp_1))
+    # print(str(emp_1))
 
+    # These two lines of code do the same thing as the two lines above.
+    print(emp_1.__repr__())
+    print(emp_1.__str__())
 
+    print(len(emp_1))
 
+    print(sum([emp_1, emp_2])) # 110000
 
+    # Totals that stay current as the team changes, without adding everyone up again
+    team = EmployeeCollection([emp_1, emp_2])
+    emp_1.apply_raise()
+    team.add(Employee('Zendaya', 'Coleman', 80000))
+    print(team.sum(), team.mean()) # 192000 64000.0
+    print(team.top(2)) # [Employee('Zendaya', 'Coleman', 80000), Employee('Jacob', 'Elordi', 60000)]
+    print(team.by_class()[Employee]) # (3, 192000)
@@ -0,0 +1,250 @@
+"""Benchmarks for the jumbler and enrollment pipelines.
+
+Generates synthetic word lists and rosters of each requested size, then
+times each phase of each pipeline separately (load, index build, query,
+aggregate ...) and reports rows per second and peak resident memory.
+Every (pipeline, size) case runs in a fresh Python process, so peak RSS
+belongs to that case alone.
+
+Results can be saved as a JSON baseline and later runs compared against
+it; a phase that got slower (or a case that got bigger) by more than the
+threshold is flagged as a regression and the exit status is 1.
+
+    python bench.py --sizes 1e3,1e4,1e5 --repeat 3 --save laptop
+    python bench.py --sizes 1e3,1e4,1e5 --repeat 3 --compare laptop
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECTS = os.path.dirname(HERE)
+JUMBLER_DIR = os.path.join(PROJECTS, "jumbler")
+ENROLLMENT_DIR = os.path.join(PROJECTS, "enrollment-main")
+BASELINES = os.path.join(HERE, "baselines")
+
+PIPELINES = ["jumbler", "enrollment"]
+# Roster-like values: a few class standings and a couple hundred majors
+CLASSES = ["FR", "SO", "JR", "SR", "GR"]
+MAJORS = ["M{:03d}".format(i) for i in range(200)]
+QUERIES = 10_000
+
+
+def generate_words(path: str, rows: int, seed: int = 210):
+    """Write rows random lowercase 'words' of 3 to 12 letters, one per line."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    with open(path, "w") as f:
+        for _ in range(rows):
+            f.write("".join(rng.choices(letters, k=rng.randint(3, 12))) + "\n")
+
+
+def generate_roster(path: str, rows: int, seed: int = 210):
+    """Write a Class,Major roster with rows students."""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("Class,Major\n")
+        for _ in range(rows):
+            f.write(f"{rng.choice(CLASSES)},{rng.choice(MAJORS)}\n")
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class Phases:
+    """Wall-clock time of each named phase, in order.
+
+    items holds the number of items a phase handled, for the phases that
+    don't handle every row of the case; None means the phase has no
+    meaningful throughput (opening a file, say).
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.items = {}
+
+    def time(self, name: str, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.seconds[name] = time.perf_counter() - start
+        return result
+
+
+def run_jumbler(workdir: str, rows: int) -> Phases:
+    sys.path.insert(0, JUMBLER_DIR)
+    import jumbler
+
+    dict_path = os.path.join(workdir, "words.txt")
+    generate_words(dict_path, rows)
+    phases = Phases()
+    words = phases.time("load", jumbler.load_words, dict_path)
+    index = phases.time("index build", jumbler.build_index, words)
+    phases.time("index write", jumbler.write_index, dict_path,
+                jumbler.index_path(dict_path), index)
+    mapped = phases.time("index open", jumbler.open_index, dict_path)
+    phases.items["index open"] = None  # maps the file; no per-row work
+
+    rng = random.Random(211)
+    queries = [rng.choice(words) for _ in range(QUERIES)]
+    phases.time("query (dict)", lambda: [jumbler.find_anagrams(q, index) for q in queries])
+    phases.time("query (mmap)", lambda: [jumbler.find_anagrams(q, mapped) for q in queries])
+    phases.items["query (dict)"] = phases.items["query (mmap)"] = QUERIES
+    mapped.close()
+    return phases
+
+
+def run_enrollment(workdir: str, rows: int) -> Phases:
+    sys.path.insert(0, ENROLLMENT_DIR)
+    import main as enrollment
+    from columns import ColumnTable
+
+    roster = os.path.join(workdir, "roster.csv")
+    generate_roster(roster, rows)
+    phases = Phases()
+    majors = phases.time("load", enrollment.read_csv_column, roster, "Major")
+    phases.time("aggregate", enrollment.counts, majors)
+    del majors
+    phases.time("stream aggregate", enrollment.count_csv_column, roster, "Major")
+    table = phases.time("columnar load", ColumnTable.from_csv, roster)
+    phases.time("columnar aggregate", lambda: table["Major"].counts())
+    programs = phases.time("program table load", enrollment.ProgramTable.from_csv, enrollment.PROGRAMS)
+    # The programs file is fixed, whatever the roster size
+    phases.items["program table load"] = len(programs.by_code)
+    return phases
+
+
+def run_case(pipeline: str, rows: int) -> dict:
+    """Run one case in this process and return its measurements."""
+    with tempfile.TemporaryDirectory() as workdir:
+        if pipeline == "jumbler":
+            phases = run_jumbler(workdir, rows)
+        else:
+            phases = run_enrollment(workdir, rows)
+    # Phases handle all rows unless they said otherwise
+    throughput = {}
+    for phase, elapsed in phases.seconds.items():
+        items = phases.items.get(phase, rows)
+        throughput[phase] = None if items is None else items / max(elapsed, 1e-9)
+    return {"pipeline": pipeline, "rows": rows, "seconds": phases.seconds,
+            "per_second": throughput, "peak_rss_kb": peak_rss_kb()}
+
+
+def run_isolated(pipeline: str, rows: int) -> dict:
+    """run_case in a fresh interpreter, so peak RSS covers this case only."""
+    output = subprocess.run([sys.executable, __file__, "--case", pipeline, str(rows)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def best_of(runs: list[dict]) -> dict:
+    """Combine repeated runs of one case: fastest time per phase, lowest peak RSS."""
+    best = dict(runs[0])
+    best["seconds"] = {phase: min(run["seconds"][phase] for run in runs) for phase in best["seconds"]}
+    best["per_second"] = {phase: None if rate is None else max(run["per_second"][phase] for run in runs)
+                          for phase, rate in best["per_second"].items()}
+    peaks = [run["peak_rss_kb"] for run in runs if run["peak_rss_kb"]]
+    best["peak_rss_kb"] = min(peaks) if peaks else None
+    return best
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float,
+            min_seconds: float = 0.0) -> list[str]:
+    """Descriptions of every phase or peak RSS more than threshold worse than baseline.
+
+    Phases that took under min_seconds in both runs are too short to
+    time reliably and are not compared.
+    """
+    before = {(case["pipeline"], case["rows"]): case for case in baseline}
+    regressions = []
+    for case in results:
+        old = before.get((case["pipeline"], case["rows"]))
+        if old is None:
+            continue
+        label = f"{case['pipeline']} {case['rows']:,} rows"
+        for phase, seconds in case["seconds"].items():
+            old_seconds = old["seconds"].get(phase)
+            if max(seconds, old_seconds or 0) < min_seconds:
+                continue
+            if old_seconds and seconds > old_seconds * (1 + threshold):
+                regressions.append(f"{label}: {phase} {old_seconds:.4f}s -> {seconds:.4f}s")
+        if (old["peak_rss_kb"] and case["peak_rss_kb"]
+                and case["peak_rss_kb"] > old["peak_rss_kb"] * (1 + threshold)):
+            regressions.append(f"{label}: peak RSS {old['peak_rss_kb']:,} KB"
+                               f" -> {case['peak_rss_kb']:,} KB")
+    return regressions
+
+
+def print_case(case: dict):
+    rss = f"{case['peak_rss_kb']:,} KB" if case["peak_rss_kb"] else "n/a"
+    print(f"{case['pipeline']}, {case['rows']:,} rows (peak RSS {rss})")
+    for phase, seconds in case["seconds"].items():
+        rate = case["per_second"][phase]
+        print(f"  {phase:20s} {seconds:9.4f}s" + ("" if rate is None else f" {rate:14,.0f}/s"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the jumbler and enrollment pipelines.")
+    parser.add_argument("--sizes", default="1e3,1e4,1e5",
+                        help="comma-separated row counts, e.g. 1e3,1e5,1e7 (default: 1e3,1e4,1e5)")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES),
+                        help="comma-separated subset of: " + ", ".join(PIPELINES))
+    parser.add_argument("--save", metavar="NAME", help="save results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME",
+                        help="flag regressions against baselines/NAME.json")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="fractional slowdown or growth counted as a regression (default: 0.20)")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                        help="don't compare phases shorter than this (default: 0.01)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run each case this many times and keep the best (default: 1)")
+    parser.add_argument("--case", nargs=2, metavar=("PIPELINE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Child process: run one case and hand back JSON on stdout
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    sizes = [int(float(size)) for size in args.sizes.split(",")]
+    pipelines = args.pipelines.split(",")
+    results = []
+    for pipeline in pipelines:
+        if pipeline not in PIPELINES:
+            parser.error(f"unknown pipeline {pipeline!r}")
+        for rows in sizes:
+            case = best_of([run_isolated(pipeline, rows) for _ in range(args.repeat)])
+            print_case(case)
+            results.append(case)
+
+    if args.save:
+        os.makedirs(BASELINES, exist_ok=True)
+        with open(os.path.join(BASELINES, args.save + ".json"), "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline {args.save}")
+
+    if args.compare:
+        with open(os.path.join(BASELINES, args.compare + ".json")) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_seconds)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Columnar loader for the enrollment CSV files.
+
+Instead of a list of string fields per row, a CSV file is loaded as one
+typed column per header.  Term fields (Active Term, Inactive Term, End
+Term) become arrays of integers, with 0 for a blank term.  Every other
+field is dictionary-encoded: each distinct string is stored once and the
+column itself is an array of small integer codes, 1 or 2 bytes per row
+for fields like Class, Major, School and Status.  Group-by counts are
+then counts of those integer codes.
+"""
+
+import csv
+import os
+from array import array
+from collections import Counter
+
+# Data files live in the same folder as this script
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Fields holding a term like 202201, parsed to int (0 when blank)
+TERM_FIELDS = {"Active Term", "Inactive Term", "End Term"}
+
+
+class EncodedColumn:
+    """A column of strings stored as integer codes into a table of distinct values.
+
+    The code array starts at one byte per row and is widened only when
+    the number of distinct values needs it.
+
+    >>> column = EncodedColumn(["CS", "CIS", "CS", "MATH", "CS"])
+    >>> list(column.codes), column.values
+    ([0, 1, 0, 2, 0], ['CS', 'CIS', 'MATH'])
+    >>> column[3], len(column)
+    ('MATH', 5)
+    >>> column.counts()
+    {'CS': 3, 'CIS': 1, 'MATH': 1}
+    """
+
+    def __init__(self, items=()):
+        self.values = []
+        self.code_of = {}
+        self.codes = array("B")
+        for item in items:
+            self.append(item)
+
+    def append(self, item: str):
+        code = self.code_of.get(item)
+        if code is None:
+            code = len(self.values)
+            self.code_of[item] = code
+            self.values.append(item)
+            if code > 2 ** (8 * self.codes.itemsize) - 1:
+                # Out of codes at this width: copy into the next wider type
+                self.codes = array("H" if self.codes.typecode == "B" else "I", self.codes)
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def counts(self) -> dict[str, int]:
+        """Count of each value, largest first.  Counter tallies the codes in C."""
+        return {self.values[code]: count for code, count in Counter(self.codes).most_common()}
+
+
+class ColumnTable:
+    """A CSV file with headers, loaded as typed columns.
+
+    >>> roster = ColumnTable.from_csv(os.path.join(HERE, "test_roster.csv"))
+    >>> len(roster), roster.fields
+    (6, ['Note', 'Class', 'Major'])
+    >>> roster["Major"].counts()
+    {'CIS': 2, 'DSCI': 1, 'BADM': 1, 'BIC': 1, 'GSS': 1}
+    >>> roster.group_counts("Class", "Major")[("JR", "CIS")]
+    1
+    >>> programs = ColumnTable.from_csv(os.path.join(HERE, "test_programs.csv"))
+    >>> list(programs["Active Term"])
+    [202201, 0, 0, 201701]
+    """
+
+    def __init__(self, fields: list[str]):
+        self.fields = fields
+        self.columns = {field: array("i") if field in TERM_FIELDS else EncodedColumn()
+                        for field in fields}
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ColumnTable":
+        """Load a CSV file with headers, streaming it one row at a time."""
+        with open(path, "r", newline="") as csv_file:
+            csv_reader = csv.reader(csv_file)
+            table = cls(next(csv_reader))
+            # Pair each column's append method with its parser once, not per row
+            appenders = [(table.columns[field].append, int if field in TERM_FIELDS else None)
+                         for field in table.fields]
+            for row in csv_reader:
+                # Skip blank lines; pad short rows so the columns stay aligned
+                if not row:
+                    continue
+                if len(row) < len(appenders):
+                    row += [""] * (len(appenders) - len(row))
+                for (append, parse), value in zip(appenders, row):
+                    if parse is None:
+                        append(value)
+                    else:
+                        append(parse(value) if value else 0)
+        return table
+
+    def __getitem__(self, field: str):
+        return self.columns[field]
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]]) if self.fields else 0
+
+    def group_counts(self, *fields: str) -> dict[tuple, int]:
+        """Count of each combination of values of the given encoded fields.
+
+        The codes of all the fields are combined into one integer key per
+        row, the keys are tallied, and only the distinct keys are decoded.
+        """
+        columns = [self.columns[field] for field in fields]
+        keys = array("Q", [0]) * len(self)
+        for column in columns:
+            width = len(column.values)
+            keys = array("Q", (key * width + code for key, code in zip(keys, column.codes)))
+        summary = {}
+        for key, count in Counter(keys).most_common():
+            combination = []
+            for column in reversed(columns):
+                key, code = divmod(key, len(column.values))
+                combination.append(column.values[code])
+            summary[tuple(reversed(combination))] = count
+        return summary
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+    print("Doctests complete!")
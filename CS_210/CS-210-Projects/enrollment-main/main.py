@@ -4,15 +4,368 @@ Author:  John Moore
 Credits: Soundcloud Rap music to electirc guitar background for focus.
 """
 
+import argparse
 import doctest
 import csv
+import glob
+import json
+import multiprocessing
+import os
+import pickle
+import tempfile
+from collections import Counter
+from typing import Iterable, Iterator
 
-def read_csv_column(path: str, field: str) -> list[str]:
-    """Read one column from a CSV file with headers into a list of strings."""
-    
-    with open('C:\\Users\\johnm\\dev\\UO CS Work\\CS 210\\CS-210-Projects\\enrollment-main\\data\\test_roster.csv', 'r') as csv_file:
+from columns import ColumnTable
+
+# Data files live in the same folder as this script
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROSTER = os.path.join(HERE, "roster_selected.csv")
+PROGRAMS = os.path.join(HERE, "programs.csv")
+
+
+def write_atomically(path: str, write, mode: str = "w"):
+    """Call write(file) on a new temporary file next to path, then rename it over path.
+
+    Each call gets a temporary file of its own, so processes writing the
+    same path at once don't write over each other; the last rename wins,
+    and readers only ever see a complete file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as tmp_file:
+            write(tmp_file)
+        os.chmod(tmp_path, 0o644)  # mkstemp makes it private
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def iter_csv_column(path: str, field: str) -> Iterator[str]:
+    """Yield one column from a CSV file with headers, one row at a time.
+
+    Only the current row is held in memory, so this works the same on a
+    roster of a few hundred rows or a multi-GB registrar export.
+
+    >>> column = iter_csv_column(os.path.join(HERE, "test_roster.csv"), "Major")
+    >>> next(column)
+    'DSCI'
+    >>> list(column)
+    ['CIS', 'BADM', 'BIC', 'CIS', 'GSS']
+    """
+    with open(path, "r", newline="") as csv_file:
         csv_reader = csv.reader(csv_file)
+        header = next(csv_reader, [])
+        if field not in header:
+            raise ValueError(f"{path} has no column {field!r}")
+        position = header.index(field)
+        for row in csv_reader:
+            # Skip blank lines rather than treating them as a value
+            if row:
+                yield row[position]
+
+
+def read_csv_column(path: str, field: str) -> list[str]:
+    """Read one column from a CSV file with headers into a list of strings.
+
+    >>> read_csv_column(os.path.join(HERE, "test_roster.csv"), "Major")
+    ['DSCI', 'CIS', 'BADM', 'BIC', 'CIS', 'GSS']
+    """
+    return list(iter_csv_column(path, field))
+
+
+def counts(column: Iterable[str]) -> dict[str, int]:
+    """Returns a dict with counts of elements in column.
+
+    column may be a list or any iterable, such as iter_csv_column, in
+    which case it is consumed one element at a time and never stored.
+
+    >>> counts(["dog", "cat", "cat", "rabbit", "dog"])
+    {'dog': 2, 'cat': 2, 'rabbit': 1}
+    """
+    # Accumulator pattern: a dict from element to how many times we've seen it
+    summary = {}
+    for item in column:
+        if item in summary:
+            summary[item] += 1
+        else:
+            summary[item] = 1
+    return summary
+
+
+def count_csv_column(path: str, field: str) -> dict[str, int]:
+    """Counts of each value in one column of a CSV file, read as a stream.
+
+    >>> count_csv_column(os.path.join(HERE, "test_roster.csv"), "Class")
+    {'FR': 1, 'JR': 4, 'SO': 1}
+    """
+    return counts(iter_csv_column(path, field))
+
+
+class ProgramTable:
+    """The rows of programs.csv, indexed by program code.
+
+    A code can have several rows (e.g. ACTG undergraduate and ACTG
+    graduate), so each code maps to a list of rows, in file order, and
+    lookups can narrow them by Student Type, Type and Status.
+
+    >>> table = ProgramTable.from_csv(os.path.join(HERE, "test_programs.csv"))
+    >>> len(table.lookup("ACTG"))
+    2
+    >>> table.name("ACTG")
+    'Bogus'
+    >>> table.name("ACTG", student_type="graduate")
+    'Accounting'
+    >>> table.name("ADBR", student_type="undergraduate") is None
+    True
+    >>> table.names(type="majors")["ABAO"]
+    'Applied Behavior Analysis'
+    """
+
+    def __init__(self, fields: list[str], by_code: dict[str, list[dict[str, str]]]):
+        self.fields = fields
+        self.by_code = by_code
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ProgramTable":
+        """Parse a programs CSV file (with headers) into a table."""
+        with open(path, "r", newline="") as csv_file:
+            csv_reader = csv.reader(csv_file)
+            fields = next(csv_reader)
+            by_code = {}
+            for row in csv_reader:
+                # Skip blank lines
+                if row:
+                    record = dict(zip(fields, row))
+                    by_code.setdefault(record["Code"], []).append(record)
+        return cls(fields, by_code)
+
+    @classmethod
+    def load(cls, path: str = PROGRAMS) -> "ProgramTable":
+        """The table for path, from its cache file if the CSV hasn't changed.
+
+        The first load parses the CSV and pickles the table's plain dicts
+        and lists next to it (programs.csv -> programs.cache), stamped with
+        the CSV's mtime and size; later loads with the same stamp just
+        unpickle them.
+        """
+        cache_path = os.path.splitext(path)[0] + ".cache"
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        try:
+            with open(cache_path, "rb") as cache_file:
+                cached_stamp, fields, by_code = pickle.load(cache_file)
+            if cached_stamp == stamp:
+                return cls(fields, by_code)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+
+        table = cls.from_csv(path)
+        # Write then rename, so a concurrent reader never sees half a cache
+        write_atomically(cache_path, lambda cache_file: pickle.dump(
+            (stamp, table.fields, table.by_code), cache_file, protocol=pickle.HIGHEST_PROTOCOL), "wb")
+        return table
+
+    def lookup(self, code: str, student_type: str = None, type: str = None,
+               status: str = None) -> list[dict[str, str]]:
+        """Rows for code, keeping only those that match the given filters."""
+        return [record for record in self.by_code.get(code, [])
+                if (student_type is None or record["Student Type"] == student_type)
+                and (type is None or record["Type"] == type)
+                and (status is None or record["Status"] == status)]
+
+    def name(self, code: str, **filters) -> str:
+        """Program Name of the first row for code matching filters, or None."""
+        rows = self.lookup(code, **filters)
+        return rows[0]["Program Name"] if rows else None
+
+    def names(self, **filters) -> dict[str, str]:
+        """Dict from code to program name, as described in the HOWTO."""
+        table = {}
+        for code in self.by_code:
+            name = self.name(code, **filters)
+            if name is not None:
+                table[code] = name
+        return table
+
+
+def incremental_counts(path: str, field: str, state_path: str = None) -> dict[str, int]:
+    """Counts of field in the roster at path, reading only rows appended since last time.
+
+    A small JSON state file (default: the roster path + ".state") records
+    how many bytes have been counted and the counts so far.  Each call
+    reads from that offset to the last complete line and saves the new
+    offset and counts, so a refresh costs time in proportion to what was
+    appended.  A last row with no newline yet is included in the result
+    but not saved, since it may still be being written.  If the roster
+    was truncated or rewritten (the header or the bytes just before the
+    offset no longer match), it is recounted from the start.  Rows must
+    not contain quoted newlines.
+    """
+    state_path = state_path or path + ".state"
+    try:
+        with open(state_path, "r") as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        state = None
+
+    with open(path, "rb") as roster:
+        header_line = roster.readline()
+        if state is not None:
+            # Recheck the header and the last bytes we counted before trusting the offset
+            tail = bytes.fromhex(state["tail"])
+            roster.seek(max(state["offset"] - len(tail), 0))
+            if (state["field"] != field or state["header"] != header_line.decode("utf-8")
+                    or roster.read(len(tail)) != tail):
+                state = None
+        if state is None:
+            state = {"field": field, "header": header_line.decode("utf-8"),
+                     "offset": len(header_line), "tail": "", "counts": {}}
+            if not header_line.endswith(b"\n"):
+                # Not even a complete header yet
+                return {}
+
+        header = next(csv.reader([state["header"]]))
+        if field not in header:
+            raise ValueError(f"{path} has no column {field!r}")
+        position = header.index(field)
+
+        summary = state["counts"]
+        offset = state["offset"]
+        pending = None
+        roster.seek(offset)
+        for line in roster:
+            row = next(csv.reader([line.decode("utf-8")]), [])
+            if not line.endswith(b"\n"):
+                # Possibly a row still being written: report it, but count it for real next time
+                pending = row[position] if len(row) > position else None
+                break
+            offset += len(line)
+            if row:
+                value = row[position]
+                summary[value] = summary.get(value, 0) + 1
+        roster.seek(max(offset - 64, 0))
+        tail = roster.read(offset - max(offset - 64, 0))
+
+    state.update(offset=offset, tail=tail.hex(), counts=summary)
+    # Write then rename, so an interrupted run leaves the old state intact
+    write_atomically(state_path, lambda state_file: json.dump(state, state_file))
+    if pending is not None:
+        summary = dict(summary)
+        summary[pending] = summary.get(pending, 0) + 1
+    return summary
+
+
+def roster_paths(pattern: str) -> list[str]:
+    """Roster files named by pattern: a directory (all of its .csv files)
+    or a glob such as 'rosters/*/cs210-*.csv'.  Sorted, so reports come
+    out in the same order every run.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    return sorted(glob.glob(pattern))
+
+
+def count_rosters(paths: list[str], field: str, processes: int = None) -> dict[str, Counter]:
+    """Counts of field for each roster in paths, one worker process per core.
+
+    Each roster is counted in its own worker and only its (small) Counter
+    comes back, so wall-clock time drops roughly with the number of cores.
+
+    >>> path = os.path.join(HERE, "test_roster.csv")
+    >>> per_file = count_rosters([path], "Major", processes=1)
+    >>> per_file[path]["CIS"]
+    2
+    >>> merge_counts([per_file[path], per_file[path]])["CIS"]
+    4
+    """
+    jobs = [(path, field) for path in paths]
+    if processes == 1 or len(paths) < 2:
+        results = [count_roster(*job) for job in jobs]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(count_roster, jobs)
+    return dict(zip(paths, results))
+
+
+def count_roster(path: str, field: str) -> Counter:
+    """count_csv_column as a Counter, so per-roster results can be added up."""
+    return Counter(count_csv_column(path, field))
+
+
+def merge_counts(summaries) -> Counter:
+    """One combined Counter from several per-roster summaries."""
+    combined = Counter()
+    for summary in summaries:
+        combined.update(summary)
+    return combined
+
+
+def print_report(summary: dict[str, int], programs: dict[str, str]):
+    """Print counts largest first, with the program name when the code has one."""
+    for code, count in sorted(summary.items(), key=lambda pair: pair[1], reverse=True):
+        print(f"{count:4d} {programs.get(code, code)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summary report of majors enrolled in a class.")
+    parser.add_argument("roster", nargs="?", default=ROSTER,
+                        help="roster CSV file (default: roster_selected.csv)")
+    parser.add_argument("--rosters", metavar="DIR_OR_GLOB",
+                        help="summarize every roster in a directory or matching a glob,"
+                             " in parallel, with per-file and combined reports")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes for --rosters (default: one per core)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only count rows appended since the last --incremental run,"
+                             " keeping progress in a state file next to the roster")
+    parser.add_argument("--state", help="state file for --incremental (default: ROSTER.state)")
+    parser.add_argument("--columnar", action="store_true",
+                        help="load the roster as dictionary-encoded columns and count from those")
+    parser.add_argument("--field", default="Major",
+                        help="column to summarize (default: Major)")
+    parser.add_argument("--programs", default=PROGRAMS,
+                        help="programs CSV file used to name major codes (default: programs.csv)")
+    parser.add_argument("--student-type", help="only use programs rows with this Student Type")
+    parser.add_argument("--type", help="only use programs rows with this Type, e.g. majors")
+    parser.add_argument("--status", help="only use programs rows with this Status, e.g. active")
+    parser.add_argument("--test", action="store_true", help="run the doctests instead")
+    args = parser.parse_args()
+
+    if args.test:
+        doctest.testmod()
+        print("Doctests complete!")
+        return
+
+    programs = ProgramTable.load(args.programs).names(
+        student_type=args.student_type, type=args.type, status=args.status)
+
+    if args.rosters:
+        paths = roster_paths(args.rosters)
+        if not paths:
+            parser.error(f"no roster files match {args.rosters}")
+        per_file = count_rosters(paths, args.field, args.jobs)
+        for path, summary in per_file.items():
+            print(f"== {path} ({sum(summary.values())} students)")
+            print_report(summary, programs)
+            print()
+        combined = merge_counts(per_file.values())
+        print(f"== Combined, {len(paths)} rosters ({sum(combined.values())} students)")
+        print_report(combined, programs)
+        return
+
+    if args.incremental:
+        print_report(incremental_counts(args.roster, args.field, args.state), programs)
+        return
+
+    if args.columnar:
+        print_report(ColumnTable.from_csv(args.roster)[args.field].counts(), programs)
+        return
+
+    print_report(count_csv_column(args.roster, args.field), programs)
+
 
-        for line in csv_reader:
-            print(line)
-            
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,432 @@
 """jumbler:  List dictionary words that match an anagram.
 2023-05-05 by John M.
 
-Credits: 
+Credits:
 John M. - 2023-05-05 - Initial implementation
 Youtube - slight background reserach, haha.
 """
 
+import argparse
+import functools
+import hashlib
+import itertools
+import json
+import mmap
+import multiprocessing
 import os
+import struct
+import sys
+import tempfile
 
-# Change the current working directory to the folder containing the dictionary file
-os.chdir(r"C:\Users\johnm\dev\UO CS Work\CS 210\CS-210-Projects\jumbler")
+from letter_trie import LetterTrie
+
+# The dictionary files live in the same folder as this script
+HERE = os.path.dirname(os.path.abspath(__file__))
 
 # Path to the dictionary file
-DICT = "dict.txt"
-# Open the dictionary file for reading
-dict_file = open(DICT, "r")
-
-# Initialize an empty list to store the words from the dictionary
-word_list = []
-# Read each line in the dictionary file
-for line in dict_file:
-    # Remove any trailing whitespace characters and append the word to the word_list
-    word = line.rstrip()
-    word_list.append(word)
+# DICT = os.path.join(HERE, "shortdict.txt")    # Short version for testing & debugging
+DICT = os.path.join(HERE, "dict.txt")           # Full dictionary word list
+
+# Layout of the on-disk index file (all little-endian):
+#   header:     magic, version, dictionary mtime (ns), dictionary size,
+#               sha256 of the dictionary, number of signatures, number of words
+#   signatures: one (offset, length, first word, word count) entry per
+#               signature, sorted by signature so lookups can binary search
+#   words:      one (offset, length) entry per word, grouped by signature
+#   text:       the utf-8 bytes of every signature and word
+INDEX_MAGIC = b"JUMBLIDX"
+INDEX_VERSION = 1
+HEADER = struct.Struct("<8sIqq32sII")
+SIG_ENTRY = struct.Struct("<IIII")
+WORD_ENTRY = struct.Struct("<II")
+# Where the dictionary mtime sits in the header, so it can be restamped alone
+MTIME_OFFSET = struct.calcsize("<8sI")
+
+# Word lists smaller than this are indexed in this process; starting a
+# process pool costs more than it saves
+PARALLEL_MIN_BYTES = 4 << 20
+
+
+def load_words(path: str) -> list[str]:
+    """Read the dictionary file at path into a list of words, one per line."""
+    # Initialize an empty list to store the words from the dictionary
+    word_list = []
+    # Open the dictionary file for reading; 'with' closes it for us
+    with open(path, "r") as dict_file:
+        # Read each line in the dictionary file
+        for line in dict_file:
+            # Remove any trailing whitespace characters and append the word to the word_list
+            word = line.rstrip()
+            word_list.append(word)
+    return word_list
+
 
 def normalize(word: str) -> str:
-    """Return word in lowercase, sorted."""
+    """Return word in lowercase, sorted.
+
+    >>> normalize("gamma") == normalize("MAGAM")
+    True
+    >>> normalize("KAWEA") == normalize("awake")
+    True
+    >>> normalize("KAWEA") == normalize("gamma")
+    False
+    """
     # Convert the word to lowercase
     word = word.lower()
     # Sort the characters in the word and join them back into a string
     return ''.join(sorted(word))
 
-def find_anagrams(input_word: str, word_list):
-    # Normalize the input word
-    input_word_normalized = normalize(input_word)
-    # Initialize an empty list to store the anagrams
-    anagrams = []
 
-    # Iterate through each word in the word_list
+def build_index(word_list) -> dict[str, list[str]]:
+    """Map each normalized signature to the words in word_list that have it.
+
+    Words that are anagrams of each other share a signature, so after this
+    one pass over the dictionary every lookup is a single dict probe.
+
+    >>> build_index(["beta", "gamma", "abet"])
+    {'abet': ['beta', 'abet'], 'aagmm': ['gamma']}
+    """
+    # Initialize an empty dict from signature to list of words
+    index = {}
     for word in word_list:
-        # Check if the normalized forms of the current word and input_word match
-        if normalize(word) == input_word_normalized:
-            # If they match, add the word to the list of anagrams
-            anagrams.append(word)
+        # Words are kept in dictionary order within each signature
+        index.setdefault(normalize(word), []).append(word)
+    return index
+
+
+def byte_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    """Split the file at path into about parts (start, end) byte ranges.
+
+    Each boundary is moved forward to just after a newline, so every
+    line falls entirely inside exactly one range.
+    """
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for k in range(1, parts):
+            f.seek(max(size * k // parts, bounds[-1]))
+            # Finish the line we landed in; the next range starts after it
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def range_signatures(job: tuple[str, int, int]) -> str:
+    """Signatures of the lines in one (path, start, end) byte range,
+    one per line, in file order.
+
+    Sorting letters is the expensive part of indexing, so that is all a
+    worker does; handing back one string keeps the cost of sending the
+    result to the parent process small.
+    """
+    path, start, end = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    return "\n".join(normalize(line.rstrip()) for line in chunk.decode("utf-8").splitlines())
+
+
+def build_index_parallel(path: str, processes: int = None) -> dict[str, list[str]]:
+    """build_index(load_words(path)), with signatures computed by a pool of processes.
+
+    The file is cut into byte ranges (several per process, to even out
+    the load) and each worker computes the signatures for its ranges.
+    The parent merges them with the words in file order, so the result is
+    identical to the serial build.  Small files are indexed serially.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or os.path.getsize(path) < PARALLEL_MIN_BYTES:
+        return build_index(load_words(path))
+
+    ranges = byte_ranges(path, processes * 4)
+    index = {}
+    with multiprocessing.Pool(processes) as pool, open(path, "rb") as f:
+        # imap hands back each range's signatures in range order
+        jobs = [(path, start, end) for start, end in ranges]
+        for (start, end), signatures in zip(ranges, pool.imap(range_signatures, jobs)):
+            f.seek(start)
+            words = f.read(end - start).decode("utf-8").splitlines()
+            for signature, word in zip(signatures.split("\n"), words):
+                index.setdefault(signature, []).append(word.rstrip())
+    return index
+
+
+def find_anagrams(input_word: str, index) -> list[str]:
+    """Return the words in index that are anagrams of input_word.
+
+    >>> index = build_index(["alpha", "awake", "beta", "abet"])
+    >>> find_anagrams("KAWEA", index)
+    ['awake']
+    >>> find_anagrams("bate", index)
+    ['beta', 'abet']
+    >>> find_anagrams("nosuchword", index)
+    []
+    """
+    # Look up the normalized input word; copy so callers can't change the index
+    return list(index.get(normalize(input_word), []))
+
+
+def index_path(dict_path: str) -> str:
+    """The index file lives next to its dictionary: dict.txt -> dict.idx"""
+    return os.path.splitext(dict_path)[0] + ".idx"
+
+
+def file_digest(path: str) -> bytes:
+    """sha256 of the file at path, read in blocks so big files are fine."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def write_index(dict_path: str, path: str, index: dict[str, list[str]]):
+    """Write index (from build_index) for dict_path as an index file at path.
+
+    The file is written to a temporary file of its own (so processes
+    rebuilding at the same time don't write over each other) and then
+    renamed over path, so a process that already has the old index
+    mapped keeps a complete copy and never sees a half-written file.
+    """
+    stat = os.stat(dict_path)
+    signatures = sorted(index, key=lambda sig: sig.encode("utf-8"))
+    n_words = sum(len(words) for words in index.values())
+
+    # Text starts right after the two fixed-size tables
+    text_start = (HEADER.size + len(signatures) * SIG_ENTRY.size
+                  + n_words * WORD_ENTRY.size)
+    sig_table = bytearray()
+    word_table = bytearray()
+    text = bytearray()
+    first_word = 0
+    for sig in signatures:
+        sig_bytes = sig.encode("utf-8")
+        sig_table += SIG_ENTRY.pack(text_start + len(text), len(sig_bytes),
+                                    first_word, len(index[sig]))
+        text += sig_bytes
+        for word in index[sig]:
+            word_bytes = word.encode("utf-8")
+            word_table += WORD_ENTRY.pack(text_start + len(text), len(word_bytes))
+            text += word_bytes
+        first_word += len(index[sig])
+
+    header = HEADER.pack(INDEX_MAGIC, INDEX_VERSION, stat.st_mtime_ns, stat.st_size,
+                         file_digest(dict_path), len(signatures), n_words)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(sig_table)
+            f.write(word_table)
+            f.write(text)
+        os.chmod(tmp_path, 0o644)  # mkstemp makes it private; other users share the index too
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class MappedIndex:
+    """Read-only anagram index backed by a memory-mapped index file.
+
+    Behaves like the dict from build_index for lookups (get), but nothing
+    is read until a signature is probed, and every process that opens the
+    same file shares its pages through the OS page cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be an index file")
+        (magic, version, self.dict_mtime_ns, self.dict_size,
+         self.dict_digest, self.n_sigs, self.n_words) = HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} index file")
+        self._sig_start = HEADER.size
+        self._word_start = self._sig_start + self.n_sigs * SIG_ENTRY.size
+        if len(self._map) != self._end():
+            self.close()
+            raise ValueError(f"{path} is truncated or has extra bytes; its header doesn't match its size")
+
+    def _end(self) -> int:
+        """Where the file should end, from the header's table sizes and the last text entries."""
+        end = self._word_start + self.n_words * WORD_ENTRY.size
+        if end > len(self._map):
+            return end
+        if self.n_sigs:
+            offset, length, _, _ = SIG_ENTRY.unpack_from(self._map, self._word_start - SIG_ENTRY.size)
+            end = max(end, offset + length)
+        if self.n_words:
+            offset, length = WORD_ENTRY.unpack_from(
+                self._map, self._word_start + (self.n_words - 1) * WORD_ENTRY.size)
+            end = max(end, offset + length)
+        return end
+
+    def _signature(self, i: int) -> bytes:
+        """Bytes of the i'th signature in sorted order."""
+        offset, length, _, _ = SIG_ENTRY.unpack_from(self._map, self._sig_start + i * SIG_ENTRY.size)
+        return self._map[offset:offset + length]
+
+    def get(self, signature: str, default=None):
+        """Words with this signature, or default if there are none."""
+        key = signature.encode("utf-8")
+        # Binary search for the first signature >= key
+        low, high = 0, self.n_sigs
+        while low < high:
+            mid = (low + high) // 2
+            if self._signature(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low == self.n_sigs or self._signature(low) != key:
+            return default
+        _, _, first, count = SIG_ENTRY.unpack_from(self._map, self._sig_start + low * SIG_ENTRY.size)
+        words = []
+        for entry in WORD_ENTRY.iter_unpack(
+                self._map[self._word_start + first * WORD_ENTRY.size:
+                          self._word_start + (first + count) * WORD_ENTRY.size]):
+            offset, length = entry
+            words.append(self._map[offset:offset + length].decode("utf-8"))
+        return words
+
+    def __len__(self) -> int:
+        return self.n_sigs
+
+    def close(self):
+        self._map.close()
+
+
+def open_index(dict_path: str = DICT, processes: int = None) -> MappedIndex:
+    """Open the index file for dict_path, (re)building it only if needed.
+
+    The index is reused as long as the dictionary's mtime and size match
+    the header.  If only the mtime moved (the file was touched or copied)
+    but its sha256 still matches, the header is restamped instead of
+    rebuilding.  A rebuild runs on processes worker processes (default:
+    one per core) when the word list is big enough to benefit.
+    """
+    path = index_path(dict_path)
+    stat = os.stat(dict_path)
+    try:
+        index = MappedIndex(path)
+    except (OSError, ValueError):
+        index = None
+
+    if index is not None:
+        if index.dict_mtime_ns == stat.st_mtime_ns and index.dict_size == stat.st_size:
+            return index
+        if index.dict_size == stat.st_size and index.dict_digest == file_digest(dict_path):
+            # Same content, new mtime: record the new mtime and keep the index
+            with open(path, "r+b") as f:
+                f.seek(MTIME_OFFSET)
+                f.write(struct.pack("<q", stat.st_mtime_ns))
+            index.dict_mtime_ns = stat.st_mtime_ns
+            return index
+        index.close()
+
+    write_index(dict_path, path, build_index_parallel(dict_path, processes))
+    return MappedIndex(path)
+
+
+def cached_finder(index, cache_size: int = 4096):
+    """find_anagrams against index, remembering the answers for the
+    cache_size most recently seen signatures (puzzle backlogs tend to
+    repeat jumbles).  The cache is bounded, so memory stays flat.
+    """
+    # Bounded cache from signature to the (shared, read-only) list of words
+    lookup = functools.lru_cache(maxsize=cache_size)(lambda sig: index.get(sig, []))
+    return lambda query: lookup(normalize(query))
+
+
+def answer_stream(queries, finder, out):
+    """Write one JSON line to out for each query line read from queries.
+
+    finder(query) gives the answer list for one query.  Queries are read
+    and answered one at a time, so memory stays the same no matter how
+    many there are.  Blank lines are skipped.
 
-    # Return the list of anagrams
-    return anagrams
+    >>> import io
+    >>> finder = cached_finder(build_index(["awake", "beta", "abet"]))
+    >>> answer_stream(io.StringIO("KAWEA\\n\\nbate\\nzzz\\n"), finder, sys.stdout)
+    {"query": "KAWEA", "anagrams": ["awake"]}
+    {"query": "bate", "anagrams": ["beta", "abet"]}
+    {"query": "zzz", "anagrams": []}
+    """
+    for line in queries:
+        query = line.strip()
+        if not query:
+            continue
+        result = {"query": query, "anagrams": finder(query)}
+        out.write(json.dumps(result) + "\n")
 
-# Get user input for the word to find anagrams
-input_word = input("Enter a word to find its anagrams: ")
-# Call the find_anagrams function to get the list of anagrams
-anagrams = find_anagrams(input_word, word_list)
 
-# Print the results
-print("Anagrams of", input_word, "are:", anagrams[0:])
+def main():
+    parser = argparse.ArgumentParser(description="List dictionary words that match an anagram.")
+    parser.add_argument("--batch", metavar="FILE", nargs="?", const="-",
+                        help="answer one query per line from FILE (or stdin if omitted or '-'),"
+                             " writing one JSON line per query")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes for rebuilding the index (default: one per core)")
+    parser.add_argument("--mode", choices=["exact", "sub", "phrases"], default="exact",
+                        help="exact: full-length anagrams (default); sub: every word made from"
+                             " some of the letters; phrases: multi-word anagrams using all letters")
+    parser.add_argument("--engine", choices=["mmap", "counts"], default="mmap",
+                        help="exact mode lookups: mmap (on-disk signature index, default) or"
+                             " counts (NumPy letter-count matrix, needs numpy)")
+    parser.add_argument("--min-length", type=int, default=2,
+                        help="shortest word reported (sub and phrases modes)")
+    parser.add_argument("--max-words", type=int, default=3,
+                        help="most words in a phrase (phrases mode)")
+    parser.add_argument("--limit", type=int, default=100,
+                        help="most phrases reported per query (phrases mode)")
+    parser.add_argument("--max-steps", type=int, default=2_000_000,
+                        help="most search steps per query before giving up (phrases mode)")
+    args = parser.parse_args()
 
-# Close the dictionary file
-dict_file.close()
+    if args.mode == "exact" and args.engine == "counts":
+        # NumPy is only needed for this engine, so import it only when asked
+        from letter_counts import LetterCountIndex
+        finder = cached_finder(LetterCountIndex(load_words(DICT)))
+    elif args.mode == "exact":
+        # Open the on-disk signature index, building it first if dict.txt changed
+        finder = cached_finder(open_index(DICT, args.jobs))
+    else:
+        # Sub-anagrams and phrases need the letter trie over the whole word list
+        trie = LetterTrie(load_words(DICT))
+        if args.mode == "sub":
+            finder = lambda query: trie.sub_anagrams(query, min_length=args.min_length)
+        else:
+            finder = lambda query: [" ".join(phrase) for phrase in itertools.islice(
+                trie.phrases(query, max_words=args.max_words, min_length=args.min_length,
+                             max_steps=args.max_steps),
+                args.limit)]
 
+    if args.batch is not None:
+        # Batch mode: the same index answers every query in the stream
+        if args.batch == "-":
+            answer_stream(sys.stdin, finder, sys.stdout)
+        else:
+            with open(args.batch, "r") as queries:
+                answer_stream(queries, finder, sys.stdout)
+        return
 
+    # Get user input for the word to find anagrams
+    input_word = input("Enter a word to find its anagrams: ")
+    # Call the finder for the chosen mode to get the list of anagrams
+    anagrams = finder(input_word)
 
+    # Print the results
+    print("Anagrams of", input_word, "are:", anagrams[0:])
 
 
+if __name__ == "__main__":
+    main()
+    # import doctest
+    # doctest.testmod()
+    # print("Doctests complete!")
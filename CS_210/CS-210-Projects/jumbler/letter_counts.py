@@ -0,0 +1,96 @@
+"""letter_counts:  Anagram engine over a NumPy matrix of letter counts.
+
+Every dictionary word becomes one row of an (N, 26) uint8 matrix holding
+how many of each letter a..z it has.  A query turns into one row too, and
+each kind of question is a single vectorized comparison against the
+whole matrix, with no per-word strings built at query time.
+
+Requires NumPy (pip install numpy); the rest of jumbler does not.
+"""
+
+import numpy as np
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def letter_counts(word: str) -> np.ndarray:
+    """26 counts, one per letter a..z; other characters are ignored.
+
+    >>> letter_counts("Gamma")[[0, 6, 12]].tolist()
+    [2, 1, 2]
+    """
+    counts = np.zeros(26, dtype=np.uint8)
+    for ch in word.lower():
+        pos = ord(ch) - ord("a")
+        if 0 <= pos < 26:
+            counts[pos] += 1
+    return counts
+
+
+class LetterCountIndex:
+    """Dictionary words as an (N, 26) uint8 matrix of letter counts.
+
+    get() matches the dict from jumbler.build_index, so this can stand in
+    for it behind find_anagrams.  Like normalize, only letters are
+    counted, but words with hyphens or other characters only match a
+    query that has the same extra characters.
+
+    >>> index = LetterCountIndex(["stop", "post", "top", "tops", "spot", "pots", "spots"])
+    >>> index.get("opst")
+    ['stop', 'post', 'tops', 'spot', 'pots']
+    >>> index.get("xyz", [])
+    []
+    >>> index.contains_all("tos")
+    ['stop', 'post', 'tops', 'spot', 'pots', 'spots']
+    >>> index.fits_within("OPTS")
+    ['stop', 'post', 'top', 'tops', 'spot', 'pots']
+    """
+
+    def __init__(self, word_list):
+        self.words = list(word_list)
+        lowered = [word.lower() for word in self.words]
+        # One pass over all the text at once: the row of every byte is the
+        # number of newlines before it, and bytes a..z are counted with add.at
+        text = np.frombuffer("\n".join(lowered).encode("utf-8"), dtype=np.uint8)
+        rows = np.cumsum(text == ord("\n")) if len(text) else text
+        is_letter = (text >= ord("a")) & (text <= ord("z"))
+        self.counts = np.zeros((len(self.words), 26), dtype=np.uint8)
+        np.add.at(self.counts, (rows[is_letter], text[is_letter] - ord("a")), 1)
+        # Characters other than a..z, which must match exactly (e.g. hyphens)
+        self.extras = np.full(len(self.words), "", dtype=object)
+        for row, word in enumerate(lowered):
+            if not word.isalpha() or not word.isascii():
+                self.extras[row] = "".join(sorted(ch for ch in word if ch not in LETTERS))
+        self.has_extras = self.extras != ""
+        # Total letters per word, so empty lines never count as a fit
+        self.lengths = self.counts.sum(axis=1, dtype=np.int64)
+
+    def _select(self, mask: np.ndarray) -> list[str]:
+        return [self.words[row] for row in np.flatnonzero(mask)]
+
+    def get(self, signature: str, default=None):
+        """Words whose letters are exactly those of signature, or default."""
+        query = letter_counts(signature)
+        extras = "".join(sorted(ch for ch in signature.lower() if ch not in LETTERS))
+        # Only rows with the right number of letters can match
+        rows = np.flatnonzero(self.lengths == int(query.sum()))
+        rows = rows[(self.counts[rows] == query).all(axis=1)]
+        rows = rows[self.extras[rows] == extras]
+        found = [self.words[row] for row in rows]
+        return found if found else default
+
+    def contains_all(self, letters: str) -> list[str]:
+        """Words that use every one of the letters (and possibly more)."""
+        return self._select((self.counts >= letter_counts(letters)).all(axis=1))
+
+    def fits_within(self, letters: str) -> list[str]:
+        """Words that can be spelled from the letters, without reuse."""
+        query = letter_counts(letters)
+        mask = (self.counts <= query).all(axis=1) & ~self.has_extras & (self.lengths > 0)
+        return self._select(mask)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+    print("Doctests complete!")
@@ -0,0 +1,221 @@
+"""letter_trie:  Find words and phrases that use some or all of a jumble's letters.
+
+A trie keyed on the sorted letters of each dictionary word.  Every path
+from the root spells a sorted multiset of letters, so a search can walk
+only the branches whose next letter is still available in the jumble,
+instead of trying every subset or permutation of the jumble's letters.
+"""
+
+import itertools
+import os
+from collections import Counter
+from operator import le, sub
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def letters_of(word: str) -> str:
+    """Sorted lowercase letters of word; hyphens, spaces etc. are dropped.
+
+    >>> letters_of("Add-on")
+    'addno'
+    """
+    return ''.join(sorted(ch for ch in word.lower() if ch.isalpha()))
+
+
+class TrieNode:
+    """One sorted-letter prefix: its child prefixes and the words spelled by exactly these letters."""
+
+    def __init__(self):
+        self.children = {}
+        self.words = []
+
+
+class LetterTrie:
+    """Dictionary words arranged by their sorted letters.
+
+    >>> trie = LetterTrie(["stop", "post", "top", "to", "pots", "sit", "it"])
+    >>> trie.sub_anagrams("TOPS")
+    ['post', 'pots', 'stop', 'to', 'top']
+    >>> trie.sub_anagrams("tops", min_length=3)
+    ['post', 'pots', 'stop', 'top']
+    >>> list(trie.phrases("top sit"))
+    [('sit', 'top'), ('stop', 'it'), ('post', 'it'), ('pots', 'it')]
+
+    Against the full dictionary, phrases come out as they are found, so
+    the first few of a long jumble's thousands don't wait for the rest:
+
+    >>> with open(os.path.join(HERE, "dict.txt")) as dict_file:
+    ...     full = LetterTrie(line.rstrip() for line in dict_file)
+    >>> list(full.phrases("thequickbrownfox"))
+    [('workbench', 'quit', 'fox')]
+    >>> list(full.phrases("abcdefghijklmnopq", max_words=4))
+    []
+    >>> list(itertools.islice(full.phrases("thisisaverylongsentence"), 2))
+    [('transitiveness', 'hence', 'logy'), ('secretiveness', 'anything', 'lo')]
+    """
+
+    def __init__(self, word_list):
+        self.root = TrieNode()
+        for word in word_list:
+            letters = letters_of(word)
+            if not letters:
+                continue
+            node = self.root
+            for ch in letters:
+                node = node.children.setdefault(ch, TrieNode())
+            node.words.append(word)
+
+    def fits(self, letters: str):
+        """Yield (signature, words) for every signature made from a subset of letters.
+
+        Walks the trie depth first, following a child only while the
+        jumble still has a copy of its letter, so the work is bounded by
+        the number of dictionary prefixes that fit, not by 2**len(letters).
+        """
+        remaining = Counter(letters_of(letters))
+        # Explicit stack of (node, signature so far, iterator over children)
+        stack = [(self.root, "", iter(self.root.children.items()))]
+        while stack:
+            node, prefix, children = stack[-1]
+            for ch, child in children:
+                if remaining[ch] > 0:
+                    remaining[ch] -= 1
+                    if child.words:
+                        yield prefix + ch, child.words
+                    stack.append((child, prefix + ch, iter(child.children.items())))
+                    break
+            else:
+                # Children exhausted: give this node's letter back and back up
+                stack.pop()
+                if prefix:
+                    remaining[prefix[-1]] += 1
+
+    def sub_anagrams(self, letters: str, min_length: int = 1) -> list[str]:
+        """Every word that can be made from some of the letters, sorted."""
+        found = []
+        for signature, words in self.fits(letters):
+            if len(signature) >= min_length:
+                found.extend(words)
+        return sorted(found)
+
+    def phrases(self, letters: str, max_words: int = 3, min_length: int = 2,
+                max_steps: int = 2_000_000):
+        """Yield tuples of words that together use exactly all of the letters.
+
+        The signatures that fit the whole jumble are found once, as
+        count vectors over the jumble's distinct letters.  The search then
+        works on the letters left over: only candidates that still fit
+        them are kept, and the leftover letter covered by the fewest of
+        those is the one branched on, since some word in the phrase has
+        to use it.  A leftover letter that no candidate covers ends the
+        branch at once, and (letters left, words left) states with no
+        phrase at all are remembered, so they are not searched again.
+
+        Phrases are yielded as they are found, so taking only the first
+        few (itertools.islice) only pays for those.  The search gives up
+        quietly after checking max_steps candidate words against leftover
+        letters (None for no cap), so a jumble with a huge number of
+        phrases can't run for minutes.
+        """
+        pool = letters_of(letters)
+        alphabet = sorted(set(pool))
+        position = {ch: i for i, ch in enumerate(alphabet)}
+
+        def counts_of(signature: str) -> tuple:
+            counts = [0] * len(alphabet)
+            for ch in signature:
+                counts[position[ch]] += 1
+            return tuple(counts)
+
+        candidates = [(signature, words, counts_of(signature))
+                      for signature, words in self.fits(pool)
+                      if len(signature) >= min_length]
+        candidates.sort(key=lambda cand: (-len(cand[0]), cand[0]))
+        # Candidate indexes, and for each the positions of the letters it uses
+        uses = [[i for i, n in enumerate(counts) if n] for _, _, counts in candidates]
+        index_of = {counts: i for i, (_, _, counts) in enumerate(candidates)}
+        dead = set()  # (letters left, words left) states that have no phrase
+        steps = 0
+
+        def covers(remaining: tuple, left: int, words_left: int, pool: list, skip: set,
+                   complete: bool):
+            """Yield sorted tuples of candidate indexes (from pool, less skip) using exactly remaining.
+
+            complete says that leaves every candidate that fits remaining,
+            so finding nothing means the state is dead.
+            """
+            nonlocal steps
+            if left == 0:
+                yield ()
+                return
+            key = (remaining, words_left)
+            if words_left == 0 or key in dead:
+                return
+            if words_left == 1 and complete:
+                # One word left: it has to be exactly the leftover letters
+                i = index_of.get(remaining)
+                if i is not None:
+                    yield (i,)
+                else:
+                    dead.add(key)
+                return
+            # A step is one candidate checked against the leftover letters
+            steps += len(pool)
+            if max_steps is not None and steps > max_steps:
+                raise _OutOfSteps
+            fitting = [i for i in pool if i not in skip
+                       and len(candidates[i][0]) <= left and all(map(le, candidates[i][2], remaining))]
+            found = False
+            if fitting and left <= words_left * len(candidates[fitting[0]][0]):
+                # How many fitting candidates use each leftover letter
+                coverage = [0] * len(alphabet)
+                for i in fitting:
+                    for pos in uses[i]:
+                        coverage[pos] += 1
+                needed = [pos for pos, n in enumerate(remaining) if n]
+                required = min(needed, key=coverage.__getitem__)
+                # Some word uses the required letter.  Branch on each candidate that does;
+                # later branches leave out the earlier ones, so each phrase is found once.
+                done = set()
+                for i in fitting:
+                    counts = candidates[i][2]
+                    if not counts[required]:
+                        continue
+                    rest = tuple(map(sub, remaining, counts))
+                    for cover in covers(rest, left - len(candidates[i][0]), words_left - 1, fitting,
+                                        done, complete and (not done or rest[required] == 0)):
+                        found = True
+                        yield tuple(sorted(cover + (i,)))
+                    done.add(i)
+            if not found and complete:
+                dead.add(key)
+
+        try:
+            for cover in covers(counts_of(pool), len(pool), max_words, range(len(candidates)), set(), True):
+                yield from expand([candidates[i] for i in cover])
+        except _OutOfSteps:
+            return
+
+
+class _OutOfSteps(Exception):
+    """Raised inside LetterTrie.phrases when the search runs past max_steps."""
+
+
+def expand(chosen):
+    """Every phrase from a list of (signature, words, counts) choices.
+
+    When the same signature is chosen more than once, its words are
+    taken in nondecreasing order so ('stop', 'post') and ('post', 'stop')
+    are not both produced.
+    """
+    for phrase in itertools.product(*(words for _, words, _ in chosen)):
+        if all(phrase[i - 1] <= phrase[i] for i in range(1, len(phrase))
+               if chosen[i - 1][0] == chosen[i][0]):
+            yield phrase
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+    print("Doctests complete!")